@@ -0,0 +1,51 @@
+"""
+Portfolio backtesting package.
+
+Submodules and their main objects are imported lazily on first access, so
+`import backtesting` stays cheap and matplotlib is only loaded when a
+visualize module is actually used.
+"""
+import importlib
+
+# attribute name -> submodule that defines it
+_lazy_attributes = {
+    'Base_setting': 'base_setting',
+    'Strategies': 'strategies',
+    'run_sweep': 'sweep',
+    'read_price_csv': 'tool_kits',
+    'check_weight_error': 'tool_kits',
+    'calculate_cagr': 'performance',
+    'calculate_mdd': 'performance',
+    'calculate_sharpe_ratio': 'performance',
+    'rolling_relative_performance': 'benchmark',
+    'drawdown_episodes': 'risk',
+    'build_universe_mask': 'universe',
+    'SharedPanel': 'shared_panel',
+    'attach_panel': 'shared_panel',
+    'ResultsStore': 'results_store',
+    'BacktestService': 'service',
+    'Blender': 'blend',
+    'calculate_summary': 'performance',
+}
+
+_submodules = {
+    'base_setting', 'strategies', 'performance', 'benchmark', 'risk', 'universe', 'shared_panel', 'results_store', 'service', 'blend', 'tool_kits', 'checkpoint', 'sweep', 'cli',
+    'visualize', 'visualize_v2', 'visualize_v3',
+}
+
+__all__ = sorted(_lazy_attributes)
+
+
+def __getattr__(name):
+    if name in _lazy_attributes:
+        module = importlib.import_module(f'.{_lazy_attributes[name]}', __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    if name in _submodules:
+        return importlib.import_module(f'.{name}', __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_attributes) | _submodules)
@@ -1,8 +1,16 @@
+import numpy as np
 import pandas as pd
 from typing import Callable, Tuple
 import warnings
-from strategies import Strategies
-from visualize_v3 import visualize
+try:
+    from .strategies import Strategies
+    from .checkpoint import save_checkpoint, load_checkpoint, clear_checkpoint, data_fingerprint
+    from .universe import align_universe
+except ImportError:
+    # py 파일들을 한 폴더에 두고 바로 import 하는 경우 (colab 등)
+    from strategies import Strategies
+    from checkpoint import save_checkpoint, load_checkpoint, clear_checkpoint, data_fingerprint
+    from universe import align_universe
 
 class Base_setting():
 
@@ -10,6 +18,7 @@ class Base_setting():
                  data: pd.DataFrame
                  ,investment_period: Tuple[str, str]
                  ,initial_investment: int
+                 ,universe: pd.DataFrame = None
                  ) :
         """
         Backtesting 클래스 초기화
@@ -18,6 +27,7 @@ class Base_setting():
         - data: pd.DataFrame, 백테스팅에 사용될 데이터
         - investment_period: Tuple[str, str], 투자 기간 (시작 날짜, 종료 날짜) 형태
         - initial_investmetn: int, 초기 투자금액
+        - universe: pd.DataFrame, optional, universe.build_universe_mask 로 만든 dates x assets 투자 가능 여부
         """
 
         self.data = data
@@ -25,7 +35,11 @@ class Base_setting():
         self.start_date = investment_period[0]
         self.end_date = investment_period[1]
         self.initial_investment = initial_investment
-        self.strategy = Strategies(data=self.data)
+        # 날짜, 종목 순서가 data와 다른 mask가 엉뚱한 종목을 고르지 않도록 label 기준으로 한 번 맞춥니다.
+        self.universe = None if universe is None else align_universe(universe, data)
+        self.strategy = Strategies(data=self.data, universe=self.universe)
+        # totals_only 모드에서 리밸런싱 구간별 (investment_period, port_num) 기록
+        self.holdings = []
 
     def check_duplicate_indices(data: pd.DataFrame):
         """
@@ -112,6 +126,17 @@ class Base_setting():
 
         port_weight = pd.Series(index=stock_price.index,data=weights)
 
+        # 가격이 없거나 universe 상 투자할 수 없는 종목에 할당된 비중은 0으로 처리하고 경고합니다.
+        # Weights on assets without a price or outside the universe are dropped with a warning.
+        tradable = stock_price.notna()
+        if self.universe is not None:
+            tradable &= self.universe.loc[self.start_date]
+        dropped = port_weight[~tradable & (port_weight.fillna(0) != 0)]
+        if not dropped.empty:
+            warnings.warn(f"Weights on non-tradable assets on {self.start_date} are dropped: "
+                          f"{dropped.round(4).to_dict()}", UserWarning)
+        port_weight = port_weight.where(tradable, 0)
+
        # 보유 수량 계산
         port_num = (port_weight * self.initial_investment) / stock_price
         
@@ -157,6 +182,51 @@ class Base_setting():
         # Comment updated: The total value of the portfolio for each date during the investment period can be used as the overall portfolio value
         
         return my_port  # DataFrame representing the value of the portfolio during the investment period 
+
+    def calculate_total_value(self,port_num):
+        """
+        calculate_port_value의 경량 버젼으로, 종목별 보유 금액 없이 'Total_value' 열만 계산
+
+        가격 행렬과 보유 수량의 내적(dot product)으로 총 평가금액을 구하므로,
+        dates x assets 크기의 DataFrame을 만들지 않음
+
+        Parameters:
+        - port_num : pd.series, weigth_to_num 결과값인 구매한 종목의 갯수
+
+        Returns:
+        - pd.DataFrame: 'Total_value' 열 하나만 가진 DataFrame
+        """
+        # Slicing the data for the investment period
+        df_period = self.data.loc[self.start_date:self.end_date]
+
+        if not df_period.columns.equals(port_num.index):
+            warnings.warn("The indices of df_period and port_num are not the same.\
+                           Check your input data and weights.", UserWarning)
+
+        # NaN 가격은 calculate_port_value의 sum(axis=1)과 동일하게 0으로 취급합니다.
+        # NaN prices are treated as 0, same as sum(axis=1) in calculate_port_value.
+        prices = np.nan_to_num(df_period.to_numpy(dtype=float))
+        holdings = port_num.reindex(df_period.columns).fillna(0).to_numpy(dtype=float)
+
+        return pd.DataFrame({'Total_value': prices @ holdings}, index=df_period.index)
+
+    def reconstruct_port(self,holdings=None):
+        """
+        totals_only 모드에서 저장한 리밸런싱별 보유 수량으로 종목별 보유 금액 DataFrame을 다시 만드는 메서드
+
+        Parameters:
+        - holdings : list, optional, (investment_period, port_num) 튜플의 리스트 (default is self.holdings)
+
+        Returns:
+        - pd.DataFrame: calculate_port_value 결과를 리밸런싱 구간별로 이어붙인 DataFrame
+        """
+        if holdings is None:
+            holdings = self.holdings
+
+        parts = [Base_setting(self.data,ip,0).calculate_port_value(port_num)
+                 for ip, port_num in holdings]
+
+        return pd.concat(parts,join='inner')
        
     def port_return(self, my_port):
         '''
@@ -188,12 +258,14 @@ class Base_setting():
         return port_return  # 포트폴리오의 총 수익과 누적 수익을 담고 있는 DataFrame을 반환합니다.
         # DataFrame containing the total return and cumulative return of the portfolio
 
-    def run_all(self, weights):
+    def run_all(self, weights, totals_only=False):
         '''
         Method to execute all necessary steps for portfolio return analysis.
 
         Parameters:
         - weights: dict, dictionary containing the weights of each asset in the portfolio
+        - totals_only: bool, optional, if True only 'Total_value' is computed and
+          the holdings are kept in self.holdings (default is False)
 
         Returns:
         - pd.DataFrame: DataFrame containing the total return and cumulative return of the portfolio
@@ -206,7 +278,11 @@ class Base_setting():
 
         # 포트폴리오의 보유량을 기반으로 포트폴리오의 가치를 계산합니다.
         # Calculating the value of the portfolio based on the holdings
-        my_port = self.calculate_port_value(port_num)
+        if totals_only:
+            self.holdings = [(self.investment_period, port_num)]
+            my_port = self.calculate_total_value(port_num)
+        else:
+            my_port = self.calculate_port_value(port_num)
 
         # 포트폴리오의 수익률 및 누적 수익률을 계산합니다.
         # Calculating the return and cumulative return of the portfolio
@@ -233,13 +309,20 @@ class Base_setting():
 
         return bench_return
 
-    def algorithm_rebalancing(self,function=None,window=None):
+    def algorithm_rebalancing(self,function=None,window=None,totals_only=False,
+                              checkpoint_path=None,checkpoint_every=1,run_key=None):
         '''
         Method to rebalance the portfolio using the specified algorithm 
         지정된 비중 조절 알고리즘의 함수를 호출하고, 입력받은 리밸런싱 주기에 따라 비중을 조절한 포트폴리오를 반환하는 메서드입니다.
         Parameters:
         - function: function, optional, function to generate portfolio weights (default is None)
         - window: int, optional, window size for calculating weights (default is None)
+        - totals_only: bool, optional, if True only 'Total_value' is computed and
+          the holdings of each rebalance are kept in self.holdings (default is False)
+        - checkpoint_path: str, optional, file to save the loop state to and resume from (default is None)
+        - checkpoint_every: int, optional, number of rebalances between checkpoints (default is 1)
+        - run_key: tuple, optional, key of the run from self.run_key, computed only with checkpoint_path
+          when not given (default is None)
 
         Returns:
         - pd.DataFrame: DataFrame containing the rebalanced portfolio by given function
@@ -267,15 +350,30 @@ class Base_setting():
         inv = self.initial_investment
         start_idx = self.data.index.get_loc(self.start_date)
         final_idx = len(self.data)-1
+        self.holdings = []
+        iteration = 0
+
+        # 체크포인트가 있고 같은 조건의 실행이라면, 저장된 상태에서 이어서 진행합니다.
+        # If a checkpoint of the same run exists, resume from the saved state.
+        # run_key는 데이터 전체를 hash 하므로 체크포인트를 사용할 때만 계산합니다.
+        if checkpoint_path is not None:
+            if run_key is None:
+                run_key = self.run_key(function, n, totals_only)
+            state = load_checkpoint(checkpoint_path)
+            if state is not None and state['run_key'] == run_key:
+                ip, inv, start_idx = state['ip'], state['inv'], state['start_idx']
+                full_port, self.holdings = state['full_port'], state['holdings']
+                iteration = state['iteration']
+            elif state is not None:
+                warnings.warn("The checkpoint belongs to a different run. Starting from scratch.", UserWarning)
 
         while start_idx + 2*n < final_idx:
             
-            setting = Base_setting(self.data,ip,inv)
+            setting = Base_setting(self.data,ip,inv,self.universe)
 
             weights = function(investment_period=setting.investment_period,window=n)
             
-            port_part = setting.weight_to_num(weights)
-            port_part = setting.calculate_port_value(port_part)
+            port_part = self._rebalance_part(setting,weights,totals_only)
 
             #리밸런싱 주기에 맞도록 다음 포트폴리오 계산을 위해 parameter 값을 업데이트 합니다.
             # Update the parameter values for the next portfolio calculation according to the rebalancing period.
@@ -294,29 +392,72 @@ class Base_setting():
             else:
                 full_port = pd.concat([full_port,port_part],join='inner')
 
+            iteration += 1
+            if checkpoint_path is not None and iteration % checkpoint_every == 0:
+                save_checkpoint(checkpoint_path, {'run_key': run_key, 'ip': ip, 'inv': inv,
+                                                  'start_idx': start_idx, 'full_port': full_port,
+                                                  'holdings': self.holdings, 'iteration': iteration})
+
         # 백테스팅할 기간이 window_size=n 보다 적게 남아서 iteration이 끝나고 잔여기간에 맞게 parameter를 재설정합니다.
         day_left = final_idx - start_idx
-        new_end_date = setting.inverse_pointer(ip[0],day_left)
+        new_end_date = self.inverse_pointer(ip[0],day_left)
         ip = (ip[0],new_end_date)
         
-        setting = Base_setting(self.data,ip,inv)
+        setting = Base_setting(self.data,ip,inv,self.universe)
         weights = function(investment_period=setting.investment_period,window=n)
-        port_part = setting.weight_to_num(weights)
-        port_part = setting.calculate_port_value(port_part)
+        port_part = self._rebalance_part(setting,weights,totals_only)
         full_port = pd.concat([full_port,port_part],join='inner')
 
+        # 실행이 끝났으므로 체크포인트를 정리합니다.
+        if checkpoint_path is not None:
+            clear_checkpoint(checkpoint_path)
+
         return full_port
         
-    def by_hand_rebalancing(self, window=None):
+    def run_key(self, function, window=None, totals_only=False, fingerprint=None):
+        '''
+        algorithm_rebalancing 실행 하나를 식별하는 key를 반환하는 메서드 (체크포인트와 캐시 비교용)
+        전략, 리밸런싱 주기, 투자 기간, 초기 투자금액, totals_only 외에 데이터와 universe의 fingerprint를 포함하므로,
+        가격이나 universe가 바뀌면 저장된 결과를 재사용하지 않습니다.
+        여러 실행의 key를 만들 때는 data_fingerprint 결과를 fingerprint로 넘겨 데이터를 한 번만 hash 합니다.
+        '''
+        n = 252 if window is None else window
+        if fingerprint is None:
+            fingerprint = data_fingerprint(self.data, self.universe)
+        return (getattr(function,'__name__',repr(function)), n, tuple(self.investment_period),
+                self.initial_investment, totals_only, fingerprint)
+
+    def _rebalance_part(self,setting,weights,totals_only):
+        '''
+        리밸런싱 구간 하나의 포트폴리오 가치를 계산하고, totals_only 모드일 경우 보유 수량을 기록하는 메서드
+        '''
+        port_num = setting.weight_to_num(weights)
+
+        if totals_only:
+            self.holdings.append((setting.investment_period, port_num))
+            return setting.calculate_total_value(port_num)
+
+        return setting.calculate_port_value(port_num)
+
+    def by_hand_rebalancing(self, window=None, totals_only=False):
         '''
         Method to manually rebalance the portfolio by entering weights directly.
         사용자가 직접 가중치를 입력하여 포트폴리오의 비중을 조절하는 메서드입니다.
         Parameters:
         - window: int, optional, window size for calculating weights (default is 252 trading days)
+        - totals_only: bool, optional, if True only 'Total_value' is computed and
+          the holdings of each rebalance are kept in self.holdings (default is False)
         
         Returns:
         - pd.DataFrame: DataFrame containing the rebalanced portfolio with manually entered weights
         '''
+        # matplotlib은 이 메서드에서만 필요하므로, 호출될 때 import 합니다.
+        # matplotlib is only needed here, so it is imported on call.
+        try:
+            from .visualize_v3 import visualize
+        except ImportError:
+            from visualize_v3 import visualize
+
         if window is None:
             n = 252
         else:
@@ -332,16 +473,16 @@ class Base_setting():
         inv = self.initial_investment
         start_idx = self.data.index.get_loc(self.start_date)
         final_idx = len(self.data)-1
+        self.holdings = []
 
         while start_idx + 2*n < final_idx:
-            setting = Base_setting(self.data, ip, inv)
+            setting = Base_setting(self.data, ip, inv, self.universe)
             
             # 사용자로부터 포트폴리오 가중치를 직접 입력받습니다. 사용자는 딕셔너리 형태로 가중치를 입력해야 합니다.
             weights = input("Enter weights in dictionary format & UPPER CASE!: ")
             weights = eval(weights)
             
-            port_part = setting.weight_to_num(weights)
-            port_part = setting.calculate_port_value(port_part)
+            port_part = self._rebalance_part(setting,weights,totals_only)
 
             # 다음 포트폴리오 계산을 위해 parameter 값을 업데이트 합니다.
             next_start_date = setting.inverse_pointer(ip[0], n)
@@ -361,16 +502,15 @@ class Base_setting():
 
         # 잔여 기간에 맞게 parameter를 재설정합니다.
         day_left = final_idx - start_idx
-        new_end_date = setting.inverse_pointer(ip[0], day_left)
+        new_end_date = self.inverse_pointer(ip[0], day_left)
         ip = (ip[0], new_end_date)
         
-        setting = Base_setting(self.data, ip, inv)
+        setting = Base_setting(self.data, ip, inv, self.universe)
 
         weights = input("Enter weights in dictionary format: ")
         weights = eval(weights)
         
-        port_part = setting.weight_to_num(weights)
-        port_part = setting.calculate_port_value(port_part)
+        port_part = self._rebalance_part(setting,weights,totals_only)
         full_port = pd.concat([full_port, port_part], join='inner')
 
         return full_port
@@ -0,0 +1,148 @@
+import numpy as np
+import pandas as pd
+import warnings
+
+
+def _to_return_frame(port_returns) -> pd.DataFrame:
+    """
+    Collect one or more portfolio return series into a dates x portfolios DataFrame.
+
+    Accepts a port_return DataFrame (with 'Total_return'), a Series of returns,
+    a DataFrame whose columns are return series, or a dict of any of those.
+    Duplicated dates (rebalancing dates in algorithm_rebalancing output) are compounded into one.
+    """
+    if isinstance(port_returns, pd.DataFrame) and 'Total_return' not in port_returns.columns:
+        series = dict(port_returns.items())
+    elif isinstance(port_returns, dict):
+        series = dict(port_returns)
+    else:
+        series = {'portfolio': port_returns}
+
+    frame = {}
+    for name, ret in series.items():
+        if isinstance(ret, pd.DataFrame):
+            ret = ret['Total_return']
+        frame[name] = (1 + ret).groupby(level=0).prod() - 1
+
+    return pd.DataFrame(frame)
+
+
+def _to_price_frame(benchmarks) -> pd.DataFrame:
+    """
+    Collect one or more benchmark price series (e.g. df_spy) into a dates x benchmarks DataFrame.
+    """
+    if isinstance(benchmarks, dict):
+        series = {name: bench['Close'] if isinstance(bench, pd.DataFrame) else bench
+                  for name, bench in benchmarks.items()}
+        return pd.DataFrame(series)
+    if isinstance(benchmarks, pd.Series):
+        return benchmarks.to_frame(benchmarks.name or 'benchmark')
+    return benchmarks
+
+
+def align_returns(port_returns, benchmarks) -> tuple:
+    """
+    Align portfolio returns and benchmark returns on common dates.
+
+    :param port_returns: port_return DataFrame, return Series, DataFrame of return series, or dict of those.
+    :param benchmarks: Benchmark price DataFrame/Series (e.g. df_spy) or dict {name: prices}.
+    :return: Tuple (portfolio returns, benchmark returns) of DataFrames sharing the same index.
+    """
+    port = _to_return_frame(port_returns)
+    bench = _to_price_frame(benchmarks).pct_change(fill_method=None)
+
+    # 포트폴리오 날짜 기준으로 벤치마크 수익률을 맞추고, 하나라도 비어있는 날짜는 제외합니다.
+    joined = port.join(bench, how='inner', lsuffix='_port', rsuffix='_bench').dropna()
+    if len(joined) < len(port):
+        warnings.warn(f"{len(port) - len(joined)} portfolio dates have no benchmark return and were dropped.",
+                      UserWarning)
+
+    return joined.iloc[:, :port.shape[1]].set_axis(port.columns, axis=1), \
+        joined.iloc[:, port.shape[1]:].set_axis(bench.columns, axis=1)
+
+
+def _rolling_sum(x: np.ndarray, window: int) -> np.ndarray:
+    """
+    Rolling sum along axis 0 from a single cumulative sum, O(n) regardless of window.
+    The first window-1 rows are NaN.
+    """
+    csum = np.cumsum(x, axis=0)
+    out = np.full(x.shape, np.nan)
+    out[window - 1] = csum[window - 1]
+    out[window:] = csum[window:] - csum[:-window]
+    return out
+
+
+def rolling_relative_performance(port_returns, benchmarks, window=252, periods_per_year=252) -> pd.DataFrame:
+    """
+    Rolling beta, alpha, tracking error, information ratio, up/down capture and
+    correlation of every portfolio against every benchmark.
+
+    Every metric is built from rolling sums of r_p, r_b, r_p^2, r_b^2, r_p*r_b
+    (and their up/down market parts), each computed with one cumulative sum,
+    so the cost is O(n) per window for all portfolio x benchmark pairs at once.
+
+    :param port_returns: port_return DataFrame, return Series, DataFrame of return series, or dict of those.
+    :param benchmarks: Benchmark price DataFrame/Series (e.g. df_spy) or dict {name: prices}.
+    :param window: Rolling window in trading days, or a list of windows.
+    :param periods_per_year: Periods used to annualize alpha, tracking error and information ratio.
+    :return: DataFrame with columns (portfolio, benchmark, metric); with a list of windows,
+             an extra outer 'window' column level.
+    """
+    port, bench = align_returns(port_returns, benchmarks)
+
+    if not np.isscalar(window):
+        frames = [_rolling_relative(port, bench, w, periods_per_year) for w in window]
+        return pd.concat(frames, axis=1, keys=list(window), names=['window'])
+
+    return _rolling_relative(port, bench, window, periods_per_year)
+
+
+def _rolling_relative(port: pd.DataFrame, bench: pd.DataFrame, window: int, periods_per_year: int) -> pd.DataFrame:
+    n_port, n_bench = port.shape[1], bench.shape[1]
+    if window < 2 or window > len(port):
+        raise ValueError(f"window must be between 2 and the number of aligned dates ({len(port)}).")
+
+    # (dates, portfolios, 1) x (dates, 1, benchmarks) 로 브로드캐스팅하여 모든 조합을 한 번에 계산합니다.
+    # 누적합의 자릿수 손실을 줄이기 위해 전체 평균을 뺀 값으로 분산/공분산을 계산합니다 (평행이동에 불변).
+    p_raw = port.to_numpy(dtype=float)[:, :, None]
+    b_raw = bench.to_numpy(dtype=float)[:, None, :]
+    p = p_raw - p_raw.mean(axis=0)
+    b = b_raw - b_raw.mean(axis=0)
+    a = (p_raw - b_raw) - (p_raw - b_raw).mean(axis=0)
+
+    w = window
+    mean_p = _rolling_sum(p_raw, w) / w
+    mean_b = _rolling_sum(b_raw, w) / w
+    mean_a = mean_p - mean_b
+
+    dev_p = _rolling_sum(p, w) / w
+    dev_b = _rolling_sum(b, w) / w
+    dev_a = _rolling_sum(a, w) / w
+    var_p = np.clip(_rolling_sum(p ** 2, w) / w - dev_p ** 2, 0, None)
+    var_b = np.clip(_rolling_sum(b ** 2, w) / w - dev_b ** 2, 0, None)
+    var_a = np.clip(_rolling_sum(a ** 2, w) / w - dev_a ** 2, 0, None)
+    cov = _rolling_sum(p * b, w) / w - dev_p * dev_b
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        beta = cov / var_b
+        alpha = (mean_p - beta * mean_b) * periods_per_year
+        correlation = cov / np.sqrt(var_p * var_b)
+        # 추적오차는 표본 표준편차(ddof=1)로 연율화합니다.
+        tracking_error = np.sqrt(var_a * w / (w - 1)) * np.sqrt(periods_per_year)
+        information_ratio = mean_a * periods_per_year / tracking_error
+
+        up = b_raw > 0
+        down = b_raw < 0
+        up_capture = _rolling_sum(np.where(up, p_raw, 0), w) / _rolling_sum(np.where(up, b_raw, 0), w)
+        down_capture = _rolling_sum(np.where(down, p_raw, 0), w) / _rolling_sum(np.where(down, b_raw, 0), w)
+
+    metrics = {'beta': beta, 'alpha': alpha, 'tracking_error': tracking_error,
+               'information_ratio': information_ratio, 'up_capture': up_capture,
+               'down_capture': down_capture, 'correlation': correlation}
+
+    data = np.stack([np.broadcast_to(m, (len(port), n_port, n_bench)) for m in metrics.values()], axis=-1)
+    columns = pd.MultiIndex.from_product([port.columns, bench.columns, list(metrics)],
+                                         names=['portfolio', 'benchmark', 'metric'])
+
+    return pd.DataFrame(data.reshape(len(port), -1), index=port.index, columns=columns)
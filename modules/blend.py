@@ -0,0 +1,199 @@
+import os
+import numpy as np
+import pandas as pd
+
+try:
+    from .checkpoint import save_checkpoint, load_checkpoint, data_fingerprint
+    from .sweep import resolve_strategy
+except ImportError:
+    from checkpoint import save_checkpoint, load_checkpoint, data_fingerprint
+    from sweep import resolve_strategy
+
+
+# Strategy-of-strategies blending.
+#
+# Every sub-strategy ("sleeve") is simulated once with algorithm_rebalancing (or run_all
+# for buy-and-hold) and only its daily return stream is kept. Blends are then plain
+# arithmetic on the dates x sleeves return matrix, so evaluating hundreds of
+# sleeve weightings costs a matrix product instead of hundreds of re-simulations.
+
+
+def _to_port_return(returns: pd.Series) -> pd.DataFrame:
+    # Base_setting.port_return 과 같은 형태로 반환하여 visualize_v3, calculate_summary 등에 바로 사용합니다.
+    port_return = returns.to_frame('Total_return')
+    port_return['Cum_return'] = (1 + port_return['Total_return']).cumprod() - 1
+    return port_return
+
+
+class Blender:
+
+    def __init__(self, setting, sleeves: dict, cache_dir: str = None):
+        """
+        Compute (or load from cache) the daily return stream of every sleeve.
+
+        Parameters:
+        - setting: Base_setting, data, investment period and initial investment of the sleeves
+        - sleeves: dict, {sleeve name: (strategy, window)} for rebalanced strategies
+          or {sleeve name: weights dict} for buy-and-hold
+          예시 ) {'vol_121': ('momentum_vol_weighted', 121),
+                  'quantile_60': ('momentum_performance_quantile', 60),
+                  'hold': {'AAPL': 0.5, 'KO': 0.5}}
+        - cache_dir: str, optional, directory to keep the sleeve return streams between sessions
+        """
+        self.setting = setting
+        self.sleeves = sleeves
+        self.cache_dir = cache_dir
+        # 데이터와 universe는 sleeve 마다 같으므로, 캐시를 사용할 때만 한 번 hash 합니다.
+        self._fingerprint = None if cache_dir is None else data_fingerprint(setting.data, setting.universe)
+
+        streams = {name: self._sleeve_returns(name, spec) for name, spec in sleeves.items()}
+
+        # 리밸런싱 전략은 데이터 끝까지, buy-and-hold는 투자 기간까지 계산되므로 공통 날짜만 사용합니다.
+        self.returns = pd.DataFrame(streams).dropna()
+
+    def _sleeve_returns(self, name, spec) -> pd.Series:
+        setting = self.setting
+
+        path = None
+        if self.cache_dir is not None:
+            # 가격이나 universe가 바뀌면 캐시를 다시 계산하도록 sweep과 같은 data fingerprint를 사용합니다.
+            key = (repr(spec), tuple(setting.investment_period), setting.initial_investment, self._fingerprint)
+            path = os.path.join(self.cache_dir, f'sleeve_{name}.pkl')
+            cached = load_checkpoint(path)
+            if cached is not None and cached['key'] == key:
+                return cached['returns']
+
+        if isinstance(spec, dict):
+            port_return = setting.run_all(spec, totals_only=True)
+        else:
+            strategy, window = spec
+            _, function = resolve_strategy(setting, strategy)
+            full_port = setting.algorithm_rebalancing(function, window=window, totals_only=True)
+            port_return = setting.port_return(full_port)
+
+        # 리밸런싱 날짜는 두 번 들어있으므로 같은 날짜의 수익률을 하나로 합칩니다.
+        returns = (1 + port_return['Total_return']).groupby(level=0).prod() - 1
+
+        if path is not None:
+            save_checkpoint(path, {'key': key, 'returns': returns})
+
+        return returns
+
+    def _weight_array(self, weights) -> np.ndarray:
+        if isinstance(weights, dict):
+            weights = pd.Series(weights)
+        if isinstance(weights, (pd.Series, pd.DataFrame)):
+            weights = weights.reindex(self.returns.columns, axis=-1).fillna(0)
+        return np.asarray(weights, dtype=float)
+
+    def fixed(self, weights) -> pd.DataFrame:
+        '''
+        고정 비중 블렌드 (매일 같은 비중으로 재조정)
+
+        Parameters:
+        - weights: dict or pd.Series, {sleeve name: weight}
+
+        Returns:
+        - pd.DataFrame: 'Total_return', 'Cum_return' (Base_setting.port_return 과 같은 형태)
+        '''
+        blended = self.returns.to_numpy() @ self._weight_array(weights)
+        return _to_port_return(pd.Series(blended, index=self.returns.index))
+
+    def evaluate(self, weight_grid) -> pd.DataFrame:
+        '''
+        여러 고정 비중 블렌드의 성과 지표를 한 번의 행렬곱으로 계산하는 메서드
+
+        Parameters:
+        - weight_grid: pd.DataFrame (blends x sleeves) or list of dict
+
+        Returns:
+        - pd.DataFrame: 블렌드별 비중과 cum_return, cagr, volatility, sharpe, mdd
+        '''
+        if not isinstance(weight_grid, pd.DataFrame):
+            weight_grid = pd.DataFrame(list(weight_grid))
+        weight_grid = weight_grid.reindex(columns=self.returns.columns).fillna(0)
+
+        # (dates x sleeves) @ (sleeves x blends) -> (dates x blends)
+        blended = self.returns.to_numpy() @ weight_grid.to_numpy(dtype=float).T
+        nav = np.cumprod(1 + blended, axis=0)
+        peak = np.maximum(np.maximum.accumulate(nav, axis=0), 1)
+
+        metrics = weight_grid.copy()
+        metrics['cum_return'] = nav[-1] - 1
+        metrics['cagr'] = nav[-1] ** (252 / len(nav)) - 1
+        metrics['volatility'] = blended.std(axis=0, ddof=1) * np.sqrt(252)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            metrics['sharpe'] = blended.mean(axis=0) * 252 / metrics['volatility']
+        metrics['mdd'] = np.minimum((nav / peak - 1).min(axis=0), 0)
+
+        return metrics
+
+    def _apply_weights(self, weights: pd.DataFrame, rebalance: int) -> pd.DataFrame:
+        # rebalance 일마다 정한 비중을 다음 리밸런싱까지 유지합니다.
+        # 비중은 전날까지의 수익률로만 계산하므로 (shift(1)) 미래 정보를 사용하지 않습니다.
+        weights = weights.shift(1)
+        held = weights.iloc[::rebalance].reindex(weights.index).ffill()
+        blended = (held * self.returns).sum(axis=1, min_count=1).dropna()
+        return _to_port_return(blended)
+
+    def rolling_optimized(self, window: int = 252, rebalance: int = 21, method: str = 'inverse_vol') -> pd.DataFrame:
+        '''
+        최근 window 일의 수익률로 비중을 정하는 블렌드
+
+        Parameters:
+        - window: int, 비중 계산에 사용할 기간
+        - rebalance: int, 비중을 다시 정하는 주기 (영업일)
+        - method: str, 'inverse_vol' (변동성 역수 비중) 또는 'min_variance' (최소분산 비중, 음수 비중은 0으로 처리)
+
+        Returns:
+        - pd.DataFrame: 'Total_return', 'Cum_return'
+        '''
+        if method == 'inverse_vol':
+            inverse_vol = 1 / self.returns.rolling(window).std()
+            weights = inverse_vol.div(inverse_vol.sum(axis=1), axis=0)
+
+        elif method == 'min_variance':
+            values = self.returns.to_numpy()
+            weights = pd.DataFrame(np.nan, index=self.returns.index, columns=self.returns.columns)
+            ones = np.ones(values.shape[1])
+            # 공분산 역행렬은 리밸런싱 전날에만 계산합니다 (_apply_weights 에서 하루 뒤로 밀려 적용).
+            for t in range(rebalance - 1, len(values), rebalance):
+                if t < window - 1:
+                    continue
+                cov = np.cov(values[t - window + 1:t + 1], rowvar=False)
+                raw = np.linalg.pinv(np.atleast_2d(cov)) @ ones
+                raw = np.clip(raw, 0, None)
+                weights.iloc[t] = raw / raw.sum() if raw.sum() > 0 else ones / len(ones)
+            weights = weights.ffill()
+
+        else:
+            raise ValueError(f"Unknown method: {method} (use 'inverse_vol' or 'min_variance')")
+
+        return self._apply_weights(weights, rebalance)
+
+    def performance_chased(self, window: int = 126, rebalance: int = 21, top: int = None) -> pd.DataFrame:
+        '''
+        최근 window 일 동안 성과가 좋은 sleeve에 더 많은 비중을 주는 블렌드
+
+        Parameters:
+        - window: int, 성과를 측정할 기간
+        - rebalance: int, 비중을 다시 정하는 주기 (영업일)
+        - top: int, optional, 성과 상위 top 개 sleeve만 사용
+
+        Returns:
+        - pd.DataFrame: 'Total_return', 'Cum_return'
+        '''
+        trailing = np.exp(np.log1p(self.returns).rolling(window).sum()) - 1
+
+        if top is not None:
+            rank = trailing.rank(axis=1, ascending=False, method='first')
+            trailing = trailing.where(rank <= top)
+
+        # 양의 성과에 비례한 비중, 모두 음수라면 동일 비중
+        positive = trailing.clip(lower=0).fillna(0)
+        total = positive.sum(axis=1)
+        equal = trailing.notna().div(trailing.notna().sum(axis=1), axis=0)
+        weights = positive.div(total.where(total > 0), axis=0).fillna(equal)
+        weights = weights.where(trailing.notna().any(axis=1), np.nan, axis=0)
+
+        return self._apply_weights(weights, rebalance)
@@ -0,0 +1,83 @@
+import hashlib
+import os
+import pickle
+import tempfile
+import warnings
+import pandas as pd
+
+
+def save_checkpoint(path: str, state: dict) -> None:
+    """
+    Save the engine state to disk atomically.
+
+    The state is written to a temporary file in the same directory and moved
+    over the target with os.replace, so a crash during the write leaves the
+    previous checkpoint intact instead of a half-written file.
+
+    :param path: Path of the checkpoint file.
+    :param state: Dictionary of picklable objects to store.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp_', suffix='.pkl')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        # 실패 시 임시 파일만 정리하고 기존 체크포인트는 그대로 둡니다.
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def load_checkpoint(path: str) -> dict:
+    """
+    Load a checkpoint saved with save_checkpoint.
+
+    :param path: Path of the checkpoint file.
+    :return: The stored state, or None if the file does not exist or cannot be read.
+    """
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    except (pickle.UnpicklingError, EOFError, AttributeError, ImportError) as e:
+        warnings.warn(f"Checkpoint {path} could not be loaded ({e}). Starting from scratch.", UserWarning)
+        return None
+
+
+def clear_checkpoint(path: str) -> None:
+    """
+    Remove a checkpoint file once the run it belongs to has finished.
+
+    :param path: Path of the checkpoint file.
+    """
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def _frame_hash(frame) -> str:
+    # 열 이름, 날짜, 값이 모두 같아야 같은 hash가 나오도록 합니다.
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr(list(frame.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(frame, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def data_fingerprint(data, universe=None) -> tuple:
+    """
+    Identify the price data (and universe mask) a cached result was computed from.
+
+    :param data: Price DataFrame indexed by date.
+    :param universe: Optional dates x assets universe mask.
+    :return: Tuple of shape, first and last date, and a hash of the values
+             (and of the universe mask, or None without one).
+    """
+    universe_hash = None if universe is None else (universe.shape, _frame_hash(universe))
+    return (data.shape, str(data.index[0]), str(data.index[-1]), _frame_hash(data), universe_hash)
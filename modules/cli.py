@@ -0,0 +1,182 @@
+"""
+Headless batch entry point.
+
+Runs a backtest or a strategy x window sweep described by a TOML/YAML config
+file and writes the results to disk, without a notebook or matplotlib.
+
+Example config (TOML):
+
+    data = "df_price.csv"               # your own price panel: a Date column and one column per asset
+    investment_period = ["2015-04-20", "2016-04-20"]
+    initial_investment = 10000
+    output_dir = "results"
+    totals_only = true                  # optional
+    checkpoint_dir = "checkpoints"      # optional
+    universe = true                     # optional, point-in-time mask from price availability
+    membership = "membership.csv"       # optional, also restrict to index membership periods
+    results_store = "store"             # optional, also append every run to a ResultsStore (pyarrow)
+    strategies = ["momentum_vol_weighted", "momentum_performance_weigthed"]
+    windows = [252, 121, 60]
+
+Instead of strategies/windows, a `weights` table runs a buy-and-hold backtest
+with run_all.
+
+Usage:
+    backtest run config.toml
+    python -m backtesting run config.toml
+    backtest serve --data df_price.csv --port 8765   (see service.py)
+"""
+import argparse
+import os
+
+
+def load_config(path: str) -> dict:
+    """
+    Read a TOML or YAML config file into a dictionary.
+
+    :param path: Path of a .toml, .yaml or .yml file.
+    :return: Dictionary of config values.
+    """
+    ext = os.path.splitext(path)[1].lower()
+
+    if ext == '.toml':
+        try:
+            import tomllib
+        except ModuleNotFoundError:  # python < 3.11
+            import tomli as tomllib
+        with open(path, 'rb') as f:
+            return tomllib.load(f)
+
+    if ext in ('.yaml', '.yml'):
+        try:
+            import yaml
+        except ModuleNotFoundError:
+            raise ImportError("Reading YAML configs requires PyYAML: pip install pyyaml")
+        with open(path) as f:
+            return yaml.safe_load(f)
+
+    raise ValueError(f"Unsupported config format: {ext} (use .toml, .yaml or .yml)")
+
+
+def summarize(name, window, port_return):
+    """
+    One summary row (CAGR, MDD, Sharpe, final cumulative return) for a run.
+    """
+    from .performance import calculate_summary
+
+    return {'strategy': name, 'window': window, **calculate_summary(port_return)}
+
+
+def run_config(config: dict) -> list:
+    """
+    Run the backtest or sweep described by config and write the results.
+
+    Each run's port_return is written to <output_dir>/<strategy>[_w<window>].csv
+    and one row per run to <output_dir>/summary.csv.
+
+    :param config: Dictionary as returned by load_config.
+    :return: List of summary rows.
+    """
+    import pandas as pd
+    from .base_setting import Base_setting
+    from .sweep import run_sweep
+    from .tool_kits import read_price_csv
+    from .universe import build_universe_mask, read_membership_csv
+
+    data = read_price_csv(config['data'])
+
+    universe = None
+    if 'membership' in config:
+        universe = build_universe_mask(data, read_membership_csv(config['membership']))
+    elif config.get('universe', False):
+        universe = build_universe_mask(data)
+
+    setting = Base_setting(data, tuple(config['investment_period']), config['initial_investment'], universe)
+    totals_only = config.get('totals_only', False)
+
+    output_dir = config.get('output_dir', 'results')
+    os.makedirs(output_dir, exist_ok=True)
+
+    if 'weights' in config:
+        port_return = setting.run_all(config['weights'], totals_only=totals_only)
+        runs = {('buy_and_hold', None): port_return}
+    else:
+        full_ports = run_sweep(setting, config['strategies'], config['windows'],
+                               totals_only=totals_only,
+                               checkpoint_dir=config.get('checkpoint_dir'),
+                               checkpoint_every=config.get('checkpoint_every', 1))
+        runs = {key: setting.port_return(full_port) for key, full_port in full_ports.items()}
+
+    store = None
+    if 'results_store' in config:
+        from .checkpoint import data_fingerprint
+        from .results_store import ResultsStore, run_id_from_key
+        store = ResultsStore(config['results_store'])
+        params = {'start_date': setting.start_date, 'end_date': setting.end_date,
+                  'initial_investment': float(setting.initial_investment)}
+        # 같은 설정으로 다시 실행해도 catalog에 중복 행이 생기지 않도록, 실행 조건으로 run_id를 만듭니다.
+        run_condition = (tuple(setting.investment_period), setting.initial_investment, totals_only,
+                         sorted(config.get('weights', {}).items()), data_fingerprint(data, setting.universe))
+
+    summary = []
+    for (name, window), port_return in runs.items():
+        file_name = name if window is None else f'{name}_w{window}'
+        port_return[['Total_return', 'Cum_return']].to_csv(os.path.join(output_dir, f'{file_name}.csv'))
+        summary.append(summarize(name, window, port_return))
+        if store is not None:
+            store.append(port_return, name, window, params=params,
+                         run_id=run_id_from_key((name, window) + run_condition))
+
+    pd.DataFrame(summary).to_csv(os.path.join(output_dir, 'summary.csv'), index=False)
+
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='backtest', description='Portfolio backtesting batch runner')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='run a backtest or sweep from a config file')
+    run_parser.add_argument('config', help='path of a .toml/.yaml config file')
+    run_parser.add_argument('-o', '--output-dir', help='override output_dir of the config')
+
+    serve_parser = subparsers.add_parser('serve', help='run the warm-cache HTTP/JSON backtest service')
+    serve_parser.add_argument('--data', required=True, help='path of the price csv file')
+    serve_parser.add_argument('--host', default='127.0.0.1')
+    serve_parser.add_argument('--port', type=int, default=8765)
+    serve_parser.add_argument('--workers', type=int, default=None, help='number of worker processes')
+    serve_parser.add_argument('--investment-period', nargs=2, metavar=('START', 'END'),
+                              help='default investment period of requests')
+    serve_parser.add_argument('--initial-investment', type=float, default=10000)
+    serve_parser.add_argument('--universe', action='store_true',
+                              help='apply a point-in-time universe mask from price availability')
+    serve_parser.add_argument('--membership', help='membership csv for the universe mask')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        config = load_config(args.config)
+        if args.output_dir is not None:
+            config['output_dir'] = args.output_dir
+        summary = run_config(config)
+        for row in summary:
+            print(f"{row['strategy']} (window={row['window']}): "
+                  f"cum_return {row['cum_return']:.1%}, CAGR {row['cagr']:.1%}, MDD {row['mdd']:.1%}")
+
+    elif args.command == 'serve':
+        import asyncio
+        from .service import BacktestService
+        from .tool_kits import read_price_csv
+        from .universe import read_membership_csv
+
+        membership = read_membership_csv(args.membership) if args.membership else None
+        service = BacktestService(read_price_csv(args.data), args.investment_period, args.initial_investment,
+                                  workers=args.workers, universe=args.universe, membership=membership)
+        try:
+            asyncio.run(service.serve(args.host, args.port))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            service.close()
+
+    return 0
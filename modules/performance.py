@@ -95,3 +95,23 @@ def calculate_sharpe_ratio(returns: pd.Series, df_rf: pd.DataFrame) -> list:
         sharpe_lst.append((start, end, sharpe_ratio))
         
     return sharpe_lst
+
+def calculate_summary(port_return: pd.DataFrame) -> dict:
+    """
+    Calculate the summary metrics of a run from its port_return DataFrame.
+
+    :param port_return: DataFrame with 'Total_return' and 'Cum_return' (output of Base_setting.port_return).
+    :return: Dictionary with cum_return, cagr, volatility, sharpe (without risk-free rate) and mdd.
+    """
+    returns = port_return['Total_return']
+    cum_return = port_return['Cum_return'].iloc[-1]
+
+    # port_return은 첫날 수익률부터 시작하므로, 초기 가치 1을 기준으로 계산합니다.
+    nav = 1 + port_return['Cum_return']
+    mdd = min((nav / nav.cummax().clip(lower=1) - 1).min(), 0)
+
+    cagr = (1 + cum_return) ** (252 / len(port_return)) - 1
+    volatility = returns.std() * np.sqrt(252)
+    sharpe = returns.mean() * 252 / volatility if volatility > 0 else np.nan
+
+    return {'cum_return': cum_return, 'cagr': cagr, 'volatility': volatility, 'sharpe': sharpe, 'mdd': mdd}
@@ -0,0 +1,188 @@
+import glob
+import hashlib
+import os
+import uuid
+import pandas as pd
+
+try:
+    from .performance import calculate_summary
+except ImportError:
+    from performance import calculate_summary
+
+
+# Columnar store for the outputs of many backtest runs.
+#
+# Layout under root:
+#   catalog/<run_id>.parquet             one row per run: parameters and summary metrics
+#   nav/strategy=<name>/<run_id>.parquet  Total_return and Cum_return of the run
+#
+# Queries on the catalog are pushed down to the parquet files with pyarrow.dataset,
+# and NAV series are only read when load_nav is called, so comparing hundreds
+# of runs never needs all of their frames in memory.
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.dataset
+        import pyarrow.parquet
+    except ModuleNotFoundError:
+        raise ImportError("ResultsStore requires pyarrow: pip install pyarrow")
+    return pyarrow
+
+
+def _write_parquet_atomic(table, path):
+    pa = _pyarrow()
+    # '.'으로 시작하는 파일은 pyarrow.dataset이 무시하므로, 쓰다 만 파일이 조회되지 않습니다.
+    tmp_path = os.path.join(os.path.dirname(path), f'.{os.path.basename(path)}.tmp')
+    pa.parquet.write_table(table, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def run_id_from_key(key) -> str:
+    """
+    Deterministic run_id for the conditions of a run, so that appending the same run again is skipped.
+
+    :param key: Hashable description of the run, e.g. Base_setting.run_key(...).
+    :return: 16 hex characters, like the random run_id of ResultsStore.append.
+    """
+    return hashlib.blake2b(repr(key).encode(), digest_size=8).hexdigest()
+
+
+class ResultsStore:
+
+    # 모든 실행에 공통으로 들어가는 catalog 열과 타입
+    _core_schema = {
+        'run_id': 'string', 'strategy': 'string', 'window': 'Int64', 'created': 'datetime64[ns]',
+        'cum_return': 'float64', 'cagr': 'float64', 'volatility': 'float64', 'sharpe': 'float64',
+        'mdd': 'float64',
+    }
+
+    def __init__(self, root: str):
+        """
+        Open (or create) a results store.
+
+        Parameters:
+        - root: str, directory of the store
+        """
+        self.root = root
+        os.makedirs(os.path.join(root, 'catalog'), exist_ok=True)
+        os.makedirs(os.path.join(root, 'nav'), exist_ok=True)
+
+    def append(self, port_return: pd.DataFrame, strategy: str, window: int = None,
+               params: dict = None, metrics: dict = None, run_id: str = None) -> str:
+        '''
+        실행 결과 하나(port_return)와 파라미터, 성과 지표를 저장하는 메서드
+
+        Parameters:
+        - port_return: pd.DataFrame, Base_setting.port_return 결과 ('Total_return', 'Cum_return')
+        - strategy: str, 전략 이름 (예: 'momentum_vol_weighted', 'buy_and_hold')
+        - window: int, optional, 리밸런싱 주기
+        - params: dict, optional, 추가 파라미터 (같은 이름의 파라미터는 실행마다 같은 타입이어야 함)
+        - metrics: dict, optional, 추가 또는 덮어쓸 성과 지표 (기본 지표는 calculate_summary로 계산)
+        - run_id: str, optional, 실행 조건에서 만든 고정 id (예: run_id_from_key), 이미 저장된 id라면 다시 저장하지 않음
+
+        Returns:
+        - str: 저장된 실행의 run_id
+        '''
+        pa = _pyarrow()
+        if run_id is None:
+            run_id = uuid.uuid4().hex[:16]
+        elif self.contains(run_id):
+            return run_id
+
+        nav_dir = os.path.join(self.root, 'nav', f'strategy={strategy}')
+        os.makedirs(nav_dir, exist_ok=True)
+        nav = port_return[['Total_return', 'Cum_return']].rename_axis('Date').reset_index()
+        _write_parquet_atomic(pa.Table.from_pandas(nav, preserve_index=False),
+                              os.path.join(nav_dir, f'{run_id}.parquet'))
+
+        # NAV를 먼저 쓰고 catalog를 나중에 써서, catalog에 있는 실행은 항상 NAV를 가지도록 합니다.
+        row = {'run_id': run_id, 'strategy': strategy, 'window': window,
+               'created': pd.Timestamp.now(), **calculate_summary(port_return)}
+        row.update(metrics or {})
+        row.update(params or {})
+        catalog = pd.DataFrame([row]).astype(self._core_schema)
+        _write_parquet_atomic(pa.Table.from_pandas(catalog, preserve_index=False),
+                              os.path.join(self.root, 'catalog', f'{run_id}.parquet'))
+
+        return run_id
+
+    def contains(self, run_id: str) -> bool:
+        '''
+        run_id가 catalog에 있는지 확인하는 메서드
+        '''
+        return not self.query([('run_id', '==', run_id)], columns=['run_id']).empty
+
+    def _catalog_dataset(self):
+        pa = _pyarrow()
+        dataset = pa.dataset.dataset(os.path.join(self.root, 'catalog'), format='parquet')
+        # 실행마다 params 열이 다를 수 있으므로 모든 파일의 schema를 합칩니다.
+        schemas = [fragment.physical_schema for fragment in dataset.get_fragments()]
+        if not schemas:
+            return None
+        try:
+            schema = pa.unify_schemas(schemas, promote_options='permissive')
+        except TypeError:  # pyarrow < 14
+            schema = pa.unify_schemas(schemas)
+        return pa.dataset.dataset(os.path.join(self.root, 'catalog'), format='parquet', schema=schema)
+
+    def query(self, filters=None, columns=None) -> pd.DataFrame:
+        '''
+        조건에 맞는 실행들의 catalog를 반환하는 메서드 (조건은 parquet 파일 읽기 단계에서 적용)
+
+        Parameters:
+        - filters: list, optional, pd.read_parquet 형식의 조건
+          예시 ) [('window', '<', 60), ('sharpe', '>', 1)]
+        - columns: list, optional, 반환할 열 이름
+
+        Returns:
+        - pd.DataFrame: 조건을 만족하는 실행의 catalog
+        '''
+        pa = _pyarrow()
+        dataset = self._catalog_dataset()
+        if dataset is None:
+            return pd.DataFrame(columns=columns or list(self._core_schema))
+
+        expression = pa.parquet.filters_to_expression(filters) if filters else None
+        table = dataset.to_table(columns=columns, filter=expression)
+
+        return table.to_pandas().sort_values('created', ignore_index=True) \
+            if 'created' in table.column_names else table.to_pandas()
+
+    def load_nav(self, run_id: str) -> pd.DataFrame:
+        '''
+        실행 하나의 수익률 DataFrame을 읽는 메서드 (visualize_v3에 바로 넣을 수 있음)
+
+        Parameters:
+        - run_id: str, append가 반환한 run_id
+
+        Returns:
+        - pd.DataFrame: Date 인덱스와 'Total_return', 'Cum_return' 열
+        '''
+        paths = glob.glob(os.path.join(self.root, 'nav', '*', f'{run_id}.parquet'))
+        if not paths:
+            raise KeyError(f"Run {run_id} not found in {self.root}")
+
+        return pd.read_parquet(paths[0]).set_index('Date')
+
+    def load_navs(self, run_ids) -> dict:
+        '''
+        여러 실행의 수익률 DataFrame을 {run_id: DataFrame} 형태로 읽는 메서드
+        '''
+        return {run_id: self.load_nav(run_id) for run_id in run_ids}
+
+    def compact(self):
+        '''
+        실행마다 하나씩 생긴 catalog 파일들을 하나의 파일로 합치는 메서드
+        '''
+        pa = _pyarrow()
+        dataset = self._catalog_dataset()
+        if dataset is None:
+            return
+
+        old_paths = list(dataset.files)
+        path = os.path.join(self.root, 'catalog', f'compacted-{uuid.uuid4().hex[:8]}.parquet')
+        _write_parquet_atomic(dataset.to_table(), path)
+        for old_path in old_paths:
+            os.remove(old_path)
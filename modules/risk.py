@@ -0,0 +1,218 @@
+import numpy as np
+import pandas as pd
+from statistics import NormalDist
+
+
+# Rolling risk metrics on NAV series.
+# All functions take a Series or a dates x series DataFrame of NAV (e.g. Total_value,
+# or 1 + Cum_return of port_return) or of returns, and return the same shape.
+
+
+def rolling_drawdown(nav, window: int):
+    """
+    Drawdown from the highest NAV of the trailing window.
+
+    The trailing peak uses pandas' rolling max, which keeps a monotonic deque of
+    candidate peaks, so this is O(n) per series regardless of window.
+
+    :param nav: Series or DataFrame of NAV.
+    :param window: Rolling window in trading days.
+    :return: Drawdown (<= 0) with the same shape as nav.
+    """
+    peak = nav.rolling(window, min_periods=1).max()
+    return nav / peak - 1
+
+
+def _combine(left, right):
+    # 앞 구간(left)과 바로 뒤 구간(right)의 (max, min, mdd) 요약을 합칩니다.
+    # 합친 구간의 mdd는 각 구간의 mdd 또는 앞 구간의 고점에서 뒤 구간의 저점까지의 하락입니다.
+    left_max, left_min, left_mdd = left
+    right_max, right_min, right_mdd = right
+    return (np.maximum(left_max, right_max), np.minimum(left_min, right_min),
+            np.minimum(np.minimum(left_mdd, right_mdd), right_min / left_max - 1))
+
+
+def rolling_max_drawdown(nav, window: int):
+    """
+    Maximum drawdown inside each trailing window.
+
+    Both the peak and the trough lie inside the window. Every row is summarized as
+    (max, min, mdd) and windows are aggregated with a two-stack sliding-window queue:
+    the rows are split into blocks of `window` rows, each block is scanned once from
+    the front (prefix summaries) and once from the back (suffix summaries), and a
+    window is the combination of one suffix and one prefix. This is O(n) per series
+    regardless of window, vectorized across columns. Windows with NaN are NaN.
+
+    :param nav: Series or DataFrame of NAV.
+    :param window: Rolling window in trading days.
+    :return: Rolling maximum drawdown (<= 0), NaN for the first window-1 rows.
+    """
+    frame = nav.to_frame() if isinstance(nav, pd.Series) else nav
+    values = frame.to_numpy(dtype=float)
+    n_rows, n_cols = values.shape
+    mdd = np.full(values.shape, np.nan)
+
+    if n_rows >= window:
+        # 행을 window 크기의 block으로 나눕니다 (마지막 block은 NaN으로 채움, 결과에는 사용되지 않음).
+        n_blocks = -(-n_rows // window)
+        blocks = np.full((n_blocks, window, n_cols), np.nan)
+        blocks.reshape(-1, n_cols)[:n_rows] = values
+        zeros = np.zeros((n_blocks, n_cols))
+
+        prefix = [np.empty_like(blocks) for _ in range(3)]
+        suffix = [np.empty_like(blocks) for _ in range(3)]
+
+        # block 시작부터 각 행까지의 요약 (front stack)
+        state = (blocks[:, 0], blocks[:, 0], zeros)
+        for j in range(window):
+            row = blocks[:, j]
+            if j > 0:
+                state = _combine(state, (row, row, zeros))
+            for stack, part in zip(prefix, state):
+                stack[:, j] = part
+
+        # 각 행부터 block 끝까지의 요약 (back stack)
+        state = (blocks[:, -1], blocks[:, -1], zeros)
+        for j in range(window - 1, -1, -1):
+            row = blocks[:, j]
+            if j < window - 1:
+                state = _combine((row, row, zeros), state)
+            for stack, part in zip(suffix, state):
+                stack[:, j] = part
+
+        prefix = [stack.reshape(-1, n_cols) for stack in prefix]
+        suffix = [stack.reshape(-1, n_cols) for stack in suffix]
+
+        # 행 t에서 끝나는 window는 [t - window + 1, t] 이며, 시작 행의 suffix와 끝 행의 prefix를 합칩니다.
+        end = np.arange(window - 1, n_rows)
+        begin = end - window + 1
+        combined = _combine([stack[begin] for stack in suffix], [stack[end] for stack in prefix])[2]
+        # 시작 행이 block의 첫 행이면 window가 block 하나와 같으므로 prefix만 사용합니다.
+        aligned = (begin % window == 0)[:, None]
+        mdd[window - 1:] = np.where(aligned, prefix[2][end], combined)
+
+    mdd = pd.DataFrame(mdd, index=frame.index, columns=frame.columns)
+
+    if isinstance(nav, pd.Series):
+        return mdd.iloc[:, 0]
+    return mdd
+
+
+def rolling_var_cvar(returns, window: int, level: float = 0.95, method: str = 'historical') -> tuple:
+    """
+    Rolling Value at Risk and Conditional Value at Risk (expected shortfall).
+
+    Both are reported as positive loss fractions.
+    - 'historical': VaR is the k-th worst return of the window and CVaR the mean of
+      the k worst returns, with k = ceil((1 - level) * window).
+    - 'parametric': normal distribution with the rolling mean and standard deviation.
+
+    :param returns: Series or DataFrame of periodic returns (e.g. Total_return).
+    :param window: Rolling window in trading days.
+    :param level: Confidence level, e.g. 0.95.
+    :param method: 'historical' or 'parametric'.
+    :return: Tuple (VaR, CVaR) with the same shape as returns.
+    """
+    if method == 'parametric':
+        mean = returns.rolling(window).mean()
+        std = returns.rolling(window).std()
+        z = NormalDist().inv_cdf(1 - level)
+        var = -(mean + z * std)
+        cvar = -(mean - std * NormalDist().pdf(z) / (1 - level))
+        return var, cvar
+
+    if method != 'historical':
+        raise ValueError(f"Unknown method: {method} (use 'historical' or 'parametric')")
+
+    frame = returns.to_frame() if isinstance(returns, pd.Series) else returns
+    values = frame.to_numpy(dtype=float)
+    n_rows = len(values)
+    # 부동소수점 오차로 k가 하나 커지지 않도록 반올림 후 올림합니다.
+    k = max(1, int(np.ceil(round((1 - level) * window, 9))))
+
+    var = np.full(values.shape, np.nan)
+    cvar = np.full(values.shape, np.nan)
+
+    if n_rows >= window:
+        # (windows, series, window) 형태의 복사 없는 view 입니다.
+        windows = np.lib.stride_tricks.sliding_window_view(values, window, axis=0)
+        # np.partition이 복사본을 만들기 때문에 메모리를 제한하려고 나누어 계산합니다.
+        chunk = max(1, 10_000_000 // (window * values.shape[1]))
+        for start in range(0, len(windows), chunk):
+            part = windows[start:start + chunk]
+            worst = np.partition(part, k - 1, axis=-1)[..., :k]
+            has_nan = np.isnan(part).any(axis=-1)
+            rows = slice(window - 1 + start, window - 1 + start + len(worst))
+            var[rows] = np.where(has_nan, np.nan, -worst.max(axis=-1))
+            cvar[rows] = np.where(has_nan, np.nan, -worst.mean(axis=-1))
+
+    var = pd.DataFrame(var, index=frame.index, columns=frame.columns)
+    cvar = pd.DataFrame(cvar, index=frame.index, columns=frame.columns)
+
+    if isinstance(returns, pd.Series):
+        return var.iloc[:, 0], cvar.iloc[:, 0]
+    return var, cvar
+
+
+def rolling_calmar(nav, window: int, periods_per_year: int = 252):
+    """
+    Rolling Calmar ratio: annualized return of the window over the absolute rolling max drawdown.
+
+    :param nav: Series or DataFrame of NAV.
+    :param window: Rolling window in trading days.
+    :param periods_per_year: Periods used to annualize the return.
+    :return: Rolling Calmar ratio.
+    """
+    annual_return = (nav / nav.shift(window - 1)) ** (periods_per_year / (window - 1)) - 1
+    mdd = rolling_max_drawdown(nav, window)
+    return annual_return / mdd.abs().replace(0, np.nan)
+
+
+def rolling_ulcer_index(nav, window: int):
+    """
+    Rolling Ulcer index: root mean square of the percentage drawdowns from the trailing-window peak.
+
+    :param nav: Series or DataFrame of NAV.
+    :param window: Rolling window in trading days.
+    :return: Rolling Ulcer index (in percent).
+    """
+    drawdown_pct = rolling_drawdown(nav, window) * 100
+    return np.sqrt((drawdown_pct ** 2).rolling(window, min_periods=window).mean())
+
+
+def drawdown_episodes(nav: pd.Series, threshold: float = 0.2) -> pd.DataFrame:
+    """
+    Drawdown episodes deeper than threshold, measured from the running peak.
+
+    Each row can be used directly to shade a drop period on a chart,
+    e.g. plt.axvspan(row.peak, row.trough).
+
+    :param nav: Series of NAV.
+    :param threshold: Minimum depth of an episode, e.g. 0.2 for drops of 20% or more.
+    :return: DataFrame with columns peak, trough, recovery (NaT if not recovered) and depth.
+    """
+    drawdown = nav / nav.cummax() - 1
+    at_peak = drawdown >= 0
+
+    # 새로운 고점이 나올 때마다 episode 번호가 하나씩 증가합니다.
+    # Every new peak starts a new episode.
+    episode = at_peak.cumsum()
+    underwater = drawdown[~at_peak]
+
+    if underwater.empty:
+        return pd.DataFrame(columns=['peak', 'trough', 'recovery', 'depth'])
+
+    groups = underwater.groupby(episode[~at_peak])
+    peak_dates = nav.index[at_peak.to_numpy()]
+    episodes = pd.DataFrame({
+        'peak': peak_dates[groups.size().index.to_numpy() - 1],
+        'trough': groups.idxmin().to_numpy(),
+        'depth': groups.min().to_numpy(),
+    })
+
+    # 다음 고점이 회복 날짜이며, 마지막 episode가 아직 회복되지 않았다면 NaT 입니다.
+    recovery_pos = groups.size().index.to_numpy()
+    episodes['recovery'] = [peak_dates[i] if i < len(peak_dates) else pd.NaT for i in recovery_pos]
+
+    episodes = episodes[episodes['depth'] <= -threshold]
+    return episodes[['peak', 'trough', 'recovery', 'depth']].reset_index(drop=True)
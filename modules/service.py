@@ -0,0 +1,284 @@
+"""
+Warm-cache backtest service with a local HTTP/JSON interface.
+
+The price panel is loaded once and published with SharedPanel; process-pool
+workers attach to it once at startup and keep the strategy weights they have
+computed, so repeat work is not redone. Results are cached per request,
+identical requests that arrive while one is running share a single computation,
+and sweeps stream one JSON line per grid point as soon as it finishes.
+
+Endpoints:
+    GET  /health
+    POST /backtest  {"strategy": "momentum_vol_weighted", "window": 121,
+                     "investment_period": ["2015-04-20", "2016-04-20"], "initial_investment": 10000}
+                    or {"weights": {"AAPL": 0.5, "KO": 0.5}, ...} for buy-and-hold
+    POST /sweep     {"strategies": [...], "windows": [...], ...}  -> NDJSON stream
+
+Usage:
+    backtest serve --data df_price.csv --port 8765   (df_price.csv is a price panel you supply, see cli.py)
+"""
+import asyncio
+import json
+import math
+import os
+import signal
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from .base_setting import Base_setting
+    from .performance import calculate_summary
+    from .shared_panel import SharedPanel, init_worker, worker_panel
+    from .sweep import resolve_strategy
+    from .universe import build_universe_mask
+except ImportError:
+    from base_setting import Base_setting
+    from performance import calculate_summary
+    from shared_panel import SharedPanel, init_worker, worker_panel
+    from sweep import resolve_strategy
+    from universe import build_universe_mask
+
+
+# ---- worker process side ----
+
+_worker_universe = None
+# (strategy, rebalance date, window) -> weights, 전략 가중치는 종료일과 무관하므로 재사용합니다.
+_weights_cache = {}
+_WEIGHTS_CACHE_SIZE = 100_000
+
+
+def _init_service_worker(spec, use_universe, membership):
+    global _worker_universe
+    # Ctrl+C는 service 프로세스가 받아서 pool을 정리하므로, worker는 무시합니다.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    init_worker(spec)
+    if use_universe or membership is not None:
+        _worker_universe = build_universe_mask(worker_panel(), membership)
+
+
+def _ready():
+    # worker를 미리 띄우기 위한 빈 작업입니다.
+    return os.getpid()
+
+
+def _cached_strategy(name, function):
+    def cached(investment_period, window):
+        key = (name, investment_period[0], window)
+        if key not in _weights_cache:
+            if len(_weights_cache) >= _WEIGHTS_CACHE_SIZE:
+                _weights_cache.clear()
+            _weights_cache[key] = function(investment_period=investment_period, window=window)
+        return _weights_cache[key]
+
+    cached.__name__ = name
+    return cached
+
+
+def _clean(value):
+    # JSON에는 NaN이 없으므로 None으로 바꿉니다.
+    return None if isinstance(value, float) and math.isnan(value) else value
+
+
+def run_request(request: dict) -> dict:
+    """
+    Run one backtest request inside a worker attached to the shared panel.
+
+    :param request: Normalized request (see BacktestService.normalize).
+    :return: Dictionary with strategy, window, summary metrics, dates and cumulative returns.
+    """
+    setting = Base_setting(worker_panel(), tuple(request['investment_period']),
+                           request['initial_investment'], _worker_universe)
+
+    if 'weights' in request:
+        name, window = 'buy_and_hold', None
+        port_return = setting.run_all(request['weights'], totals_only=True)
+    else:
+        name, function = resolve_strategy(setting, request['strategy'])
+        window = request['window']
+        full_port = setting.algorithm_rebalancing(_cached_strategy(name, function), window=window,
+                                                  totals_only=True)
+        port_return = setting.port_return(full_port)
+
+    summary = {key: _clean(float(value)) for key, value in calculate_summary(port_return).items()}
+
+    return {'strategy': name, 'window': window, 'summary': summary,
+            'dates': port_return.index.strftime('%Y-%m-%d').tolist(),
+            'cum_return': [_clean(v) for v in port_return['Cum_return'].tolist()]}
+
+
+# ---- service process side ----
+
+class BacktestService:
+
+    def __init__(self, data, investment_period=None, initial_investment=10000, workers=None,
+                 universe=False, membership=None, cache_size=1024):
+        """
+        Parameters:
+        - data: pd.DataFrame, price data, loaded once and shared with the workers
+        - investment_period: Tuple[str, str], optional, default investment period of requests
+        - initial_investment: int, optional, default initial investment of requests
+        - workers: int, optional, number of worker processes (default is os.cpu_count())
+        - universe: bool, optional, apply a point-in-time universe mask from price availability
+        - membership: pd.DataFrame, optional, membership periods for the universe mask
+        - cache_size: int, optional, number of results kept for repeat requests
+        """
+        self.data = data
+        self.investment_period = investment_period
+        self.initial_investment = initial_investment
+        self.cache_size = cache_size
+        self.workers = workers or os.cpu_count() or 1
+
+        self.panel = SharedPanel(data)
+        self.pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_service_worker,
+                                        initargs=(self.panel.spec, universe, membership))
+        self._results = OrderedDict()
+        self._inflight = {}
+
+    def close(self):
+        self.pool.shutdown(wait=True, cancel_futures=True)
+        self.panel.close()
+
+    def normalize(self, request: dict) -> dict:
+        '''
+        요청에 기본값을 채우고 검증하는 메서드 (같은 요청이 같은 key를 가지도록)
+        '''
+        normalized = {
+            'investment_period': list(request.get('investment_period') or self.investment_period or []),
+            'initial_investment': request.get('initial_investment', self.initial_investment),
+        }
+        if len(normalized['investment_period']) != 2:
+            raise ValueError("investment_period [start, end] is required.")
+
+        if 'weights' in request:
+            normalized['weights'] = dict(request['weights'])
+        elif 'strategy' in request:
+            normalized['strategy'] = request['strategy']
+            normalized['window'] = int(request.get('window', 252))
+        else:
+            raise ValueError("Either 'strategy' or 'weights' is required.")
+
+        return normalized
+
+    async def backtest(self, request: dict) -> dict:
+        '''
+        캐시된 결과가 있으면 바로 반환하고, 같은 요청이 이미 실행 중이면 그 결과를 함께 기다리는 메서드
+        '''
+        normalized = self.normalize(request)
+        key = json.dumps(normalized, sort_keys=True)
+
+        if key in self._results:
+            self._results.move_to_end(key)
+            return self._results[key]
+
+        if key not in self._inflight:
+            loop = asyncio.get_running_loop()
+            self._inflight[key] = loop.run_in_executor(self.pool, run_request, normalized)
+
+        try:
+            result = await asyncio.shield(self._inflight[key])
+        finally:
+            self._inflight.pop(key, None)
+
+        self._results[key] = result
+        if len(self._results) > self.cache_size:
+            self._results.popitem(last=False)
+
+        return result
+
+    async def sweep(self, request: dict):
+        '''
+        전략 x 리밸런싱 주기 조합을 병렬로 실행하고, 끝나는 순서대로 결과를 내보내는 async generator
+        '''
+        base = {key: value for key, value in request.items() if key not in ('strategies', 'windows')}
+
+        async def run_point(strategy, window):
+            # 한 조합의 실패가 스트림 전체를 끊지 않도록, 오류도 결과 한 줄로 내보냅니다.
+            try:
+                return await self.backtest({**base, 'strategy': strategy, 'window': window})
+            except Exception as e:
+                return {'strategy': strategy, 'window': window, 'error': str(e)}
+
+        tasks = [asyncio.ensure_future(run_point(strategy, window))
+                 for strategy in request['strategies'] for window in request['windows']]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    # ---- HTTP ----
+
+    async def _handle(self, reader, writer):
+        try:
+            request_line = (await reader.readline()).decode().split()
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode().strip()
+                if not line:
+                    break
+                name, _, value = line.partition(':')
+                headers[name.strip().lower()] = value.strip()
+
+            if len(request_line) < 2:
+                return
+            method, path = request_line[0], request_line[1]
+            body = await reader.readexactly(int(headers.get('content-length', 0)))
+
+            if method == 'GET' and path == '/health':
+                await self._send_json(writer, 200, {'status': 'ok', 'assets': self.data.shape[1],
+                                                    'dates': len(self.data), 'cached_results': len(self._results)})
+            elif method == 'POST' and path == '/backtest':
+                result = await self.backtest(json.loads(body or b'{}'))
+                await self._send_json(writer, 200, result)
+            elif method == 'POST' and path == '/sweep':
+                await self._stream_sweep(writer, json.loads(body or b'{}'))
+            else:
+                await self._send_json(writer, 404, {'error': f'{method} {path} not found'})
+
+        except (ValueError, KeyError, TypeError) as e:
+            await self._send_json(writer, 400, {'error': str(e)})
+        except Exception as e:
+            await self._send_json(writer, 500, {'error': repr(e)})
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _send_json(writer, status, payload):
+        body = json.dumps(payload).encode()
+        reason = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 500: 'Internal Server Error'}[status]
+        writer.write(f'HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n'
+                     f'Content-Length: {len(body)}\r\nConnection: close\r\n\r\n'.encode() + body)
+        await writer.drain()
+
+    async def _stream_sweep(self, writer, request):
+        if 'strategies' not in request or 'windows' not in request:
+            raise ValueError("'strategies' and 'windows' are required.")
+        # 첫 결과 전에 요청 형식 오류를 400으로 돌려주기 위해 미리 검증합니다.
+        self.normalize({**request, 'strategy': None})
+
+        writer.write(b'HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\n'
+                     b'Transfer-Encoding: chunked\r\nConnection: close\r\n\r\n')
+        async for result in self.sweep(request):
+            chunk = (json.dumps(result) + '\n').encode()
+            writer.write(f'{len(chunk):x}\r\n'.encode() + chunk + b'\r\n')
+            await writer.drain()
+        writer.write(b'0\r\n\r\n')
+        await writer.drain()
+
+    async def start_workers(self):
+        '''
+        process pool의 worker를 모두 미리 띄우는 메서드
+        ProcessPoolExecutor는 worker를 첫 작업 때 띄우므로, 요청 처리 중에 fork 되면 worker가
+        client 소켓을 물려받아 열어 두게 되어 응답이 끝나도 연결이 닫히지 않습니다.
+        '''
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.pool, _ready) for _ in range(self.workers)))
+
+    async def serve(self, host='127.0.0.1', port=8765):
+        # 소켓을 열기 전에 worker를 띄워서, worker가 서버나 client 소켓을 물려받지 않도록 합니다.
+        await self.start_workers()
+        server = await asyncio.start_server(self._handle, host, port)
+        print(f"Serving backtests on http://{host}:{port}")
+        async with server:
+            await server.serve_forever()
@@ -0,0 +1,142 @@
+import sys
+import weakref
+import numpy as np
+import pandas as pd
+from multiprocessing import shared_memory
+
+
+# Shared-memory price panel for process pools.
+#
+# The owner process publishes the price matrix and the date index once with
+# SharedPanel(data). Workers receive only the small spec dictionary (names,
+# shape, columns) and attach a read-only, zero-copy DataFrame view with
+# attach_panel(spec), which Base_setting and Strategies can use directly.
+#
+# Cleanup: the owner unlinks the segments on close(), on leaving a `with` block,
+# when the object is garbage collected, or at interpreter exit. If the owner is
+# killed, the multiprocessing resource tracker unlinks the segments it created.
+# Workers never unlink, so a crashing worker cannot remove the panel for the others.
+# Workers are expected to be started from the owner through multiprocessing or
+# concurrent.futures, so that they share the owner's resource tracker.
+
+
+def _unlink_segments(segments):
+    for shm in segments:
+        try:
+            shm.close()
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class SharedPanel:
+
+    def __init__(self, data: pd.DataFrame):
+        """
+        Publish a price DataFrame (dates x assets) into shared memory.
+
+        Parameters:
+        - data: pd.DataFrame, price data indexed by date
+        """
+        values = np.ascontiguousarray(data.to_numpy(dtype=np.float64))
+        dates = np.ascontiguousarray(data.index.to_numpy(dtype='datetime64[ns]').view(np.int64))
+
+        self._values_shm = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+        self._index_shm = shared_memory.SharedMemory(create=True, size=max(dates.nbytes, 1))
+        np.ndarray(values.shape, dtype=np.float64, buffer=self._values_shm.buf)[:] = values
+        np.ndarray(dates.shape, dtype=np.int64, buffer=self._index_shm.buf)[:] = dates
+
+        self.spec = {
+            'values': self._values_shm.name,
+            'index': self._index_shm.name,
+            'shape': values.shape,
+            'columns': list(data.columns),
+            'index_name': data.index.name,
+        }
+
+        self._finalizer = weakref.finalize(self, _unlink_segments, [self._values_shm, self._index_shm])
+
+    def close(self):
+        '''
+        공유 메모리를 해제하는 메서드 (여러 번 호출해도 안전)
+        '''
+        self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+# worker 프로세스에서 attach 한 SharedMemory 객체를 view가 살아있는 동안 유지합니다.
+_attached = {}
+
+
+def _attach_segment(name):
+    if name not in _attached:
+        if sys.version_info >= (3, 13):
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            # python < 3.13 에서는 attach 시에도 resource tracker에 등록됩니다. multiprocessing으로
+            # 띄운 worker는 owner와 같은 tracker를 공유하므로 같은 이름이 한 번 더 등록될 뿐이고,
+            # 해제는 owner의 unlink 또는 owner 종료 시에만 일어납니다.
+            shm = shared_memory.SharedMemory(name=name)
+        _attached[name] = shm
+    return _attached[name]
+
+
+def attach_panel(spec: dict) -> pd.DataFrame:
+    """
+    Attach to a panel published by SharedPanel and return a read-only, zero-copy DataFrame.
+
+    Parameters:
+    - spec: dict, SharedPanel.spec of the owner process
+
+    Returns:
+    - pd.DataFrame: price data backed by the shared memory segment
+    """
+    values_shm = _attach_segment(spec['values'])
+    index_shm = _attach_segment(spec['index'])
+
+    values = np.ndarray(spec['shape'], dtype=np.float64, buffer=values_shm.buf)
+    values.flags.writeable = False
+    dates = np.ndarray(spec['shape'][0], dtype=np.int64, buffer=index_shm.buf)
+
+    index = pd.DatetimeIndex(dates.view('datetime64[ns]'), name=spec['index_name'])
+
+    return pd.DataFrame(values, index=index, columns=spec['columns'], copy=False)
+
+
+def detach_panels():
+    '''
+    worker 프로세스에서 attach 한 공유 메모리를 모두 닫는 함수 (unlink는 owner만 수행)
+    '''
+    while _attached:
+        _, shm = _attached.popitem()
+        try:
+            shm.close()
+        except BufferError:
+            # 아직 view가 남아 있다면 프로세스 종료 시 해제됩니다.
+            pass
+
+
+# ProcessPoolExecutor(initializer=init_worker, initargs=(panel.spec,)) 용 worker 설정
+_worker_panel = None
+
+
+def init_worker(spec: dict):
+    '''
+    process pool의 initializer로 사용하여, worker 마다 한 번만 패널에 attach 하는 함수
+    '''
+    global _worker_panel
+    _worker_panel = attach_panel(spec)
+
+
+def worker_panel() -> pd.DataFrame:
+    '''
+    init_worker로 attach 한 패널을 반환하는 함수
+    '''
+    if _worker_panel is None:
+        raise RuntimeError("No shared panel attached. Use init_worker as the pool initializer.")
+    return _worker_panel
@@ -1,10 +1,37 @@
 import pandas as pd
 from typing import Callable, Tuple
+try:
+    from .universe import align_universe
+except ImportError:
+    from universe import align_universe
 
 class Strategies:
 
-    def __init__(self, data: pd.DataFrame):
+    def __init__(self, data: pd.DataFrame, universe: pd.DataFrame = None):
         self.data = data
+        # universe.build_universe_mask 로 만든 dates x assets 투자 가능 여부 (None이면 전 종목 사용)
+        # apply_universe는 위치로 읽으므로 data와 같은 날짜, 종목 순서로 맞춰 둡니다.
+        self.universe = None if universe is None else align_universe(universe, data)
+
+    def apply_universe(self, filtered_data: pd.DataFrame, start_idx: int) -> pd.DataFrame:
+        '''
+        리밸런싱 시점(start_idx)에 투자 가능하고, 모멘텀 계산 구간의 처음과 끝에 가격이 있는 종목만 남기는 메서드
+
+        Parameters:
+        - filtered_data: pd.DataFrame, 모멘텀 계산에 사용할 구간의 가격 데이터
+        - start_idx: int, 리밸런싱 날짜의 인덱스
+
+        Returns:
+        - pd.DataFrame: 투자 가능한 종목의 열만 남긴 filtered_data
+        '''
+        if self.universe is None:
+            return filtered_data
+
+        eligible = (self.universe.iloc[start_idx].to_numpy()
+                    & filtered_data.iloc[0].notna().to_numpy()
+                    & filtered_data.iloc[-1].notna().to_numpy())
+
+        return filtered_data.loc[:, eligible]
 
     def momentum_performance_weigthed(self, investment_period: Tuple[str, str], window: int) -> pd.Series:
         try:
@@ -29,6 +56,9 @@ class Strategies:
         # 필요한 기간에 대한 데이터 필터링
         filtered_data = self.data.iloc[start_idx-window-1:start_idx-1]
 
+        # 리밸런싱 시점에 투자 가능한 종목만 남깁니다.
+        filtered_data = self.apply_universe(filtered_data, start_idx)
+
         # 가격 데이터의 변동률 계산
         price_pct_change = filtered_data.pct_change(periods=window-1)
 
@@ -81,6 +111,9 @@ class Strategies:
         # 필요한 기간에 대한 데이터 필터링
         filtered_data = self.data.iloc[start_idx-window-1:start_idx-1]
 
+        # 리밸런싱 시점에 투자 가능한 종목만 남깁니다.
+        filtered_data = self.apply_universe(filtered_data, start_idx)
+
         # 가격 데이터의 변동률 계산
         price_pct_change = filtered_data.pct_change(periods=window-1)
 
@@ -132,6 +165,9 @@ class Strategies:
         # 필요한 기간에 대한 데이터 필터링
         filtered_data = self.data.iloc[start_idx-window-1:start_idx-1]
 
+        # 리밸런싱 시점에 투자 가능한 종목만 남깁니다.
+        filtered_data = self.apply_universe(filtered_data, start_idx)
+
         # 가격 데이터의 변동률 계산
         price_pct_change_m = filtered_data.pct_change(periods=window-1)
         price_pct_change = filtered_data.pct_change()
@@ -0,0 +1,75 @@
+import os
+import warnings
+try:
+    from .checkpoint import save_checkpoint, load_checkpoint, data_fingerprint
+except ImportError:
+    from checkpoint import save_checkpoint, load_checkpoint, data_fingerprint
+
+
+def resolve_strategy(setting, function):
+    """
+    Return the weight function for a strategy given by name or as a callable.
+
+    :param setting: Base_setting instance whose strategy object provides the methods.
+    :param function: str (e.g. 'momentum_vol_weighted') or callable.
+    :return: Tuple of (name, callable).
+    """
+    if isinstance(function, str):
+        try:
+            return function, getattr(setting.strategy, function)
+        except AttributeError:
+            raise ValueError(f"Unknown strategy: {function}")
+    return function.__name__, function
+
+
+def run_sweep(setting, functions, windows, totals_only=False, checkpoint_dir=None, checkpoint_every=1) -> dict:
+    """
+    Run algorithm_rebalancing for every (strategy, window) grid point.
+
+    With checkpoint_dir set, every finished grid point is saved to its own file and
+    skipped when the sweep is run again with the same setting (data, universe,
+    investment period and initial investment), and the grid point in progress is
+    checkpointed so an interrupted run resumes from its last rebalance.
+
+    :param setting: Base_setting instance holding the data, investment period and initial investment.
+    :param functions: List of strategy names or weight functions.
+    :param windows: List of rebalancing windows (trading days).
+    :param totals_only: If True, only 'Total_value' is computed for each run.
+    :param checkpoint_dir: Directory for checkpoint files (default is None, no checkpointing).
+    :param checkpoint_every: Number of rebalances between checkpoints of the running grid point.
+    :return: Dictionary {(strategy name, window): full_port}.
+    """
+    results = {}
+    # 데이터와 universe는 grid point 마다 같으므로 fingerprint는 한 번만 계산합니다.
+    fingerprint = None if checkpoint_dir is None else data_fingerprint(setting.data, setting.universe)
+
+    for function in functions:
+        name, func = resolve_strategy(setting, function)
+
+        for window in windows:
+            if checkpoint_dir is None:
+                results[(name, window)] = setting.algorithm_rebalancing(func, window=window,
+                                                                        totals_only=totals_only)
+                continue
+
+            stem = f'{name}_w{window}' + ('_totals' if totals_only else '')
+            done_path = os.path.join(checkpoint_dir, f'{stem}.pkl')
+            partial_path = os.path.join(checkpoint_dir, f'{stem}.partial.pkl')
+
+            # 이미 끝난 grid point는 다시 계산하지 않습니다.
+            # Skip grid points that already finished.
+            run_key = setting.run_key(func, window, totals_only, fingerprint)
+            done = load_checkpoint(done_path)
+            if done is not None and done.get('run_key') == run_key:
+                results[(name, window)] = done['full_port']
+                continue
+            elif done is not None:
+                warnings.warn(f"{done_path} belongs to a different run. Recomputing.", UserWarning)
+
+            full_port = setting.algorithm_rebalancing(func, window=window, totals_only=totals_only,
+                                                      checkpoint_path=partial_path,
+                                                      checkpoint_every=checkpoint_every, run_key=run_key)
+            save_checkpoint(done_path, {'run_key': run_key, 'full_port': full_port, 'holdings': setting.holdings})
+            results[(name, window)] = full_port
+
+    return results
@@ -41,3 +41,19 @@ def check_duplicate_indices(data: pd.DataFrame):
         print("Check out with .index.duplicated() function")
     else:
         print("No duplicate indices.")
+
+
+def read_price_csv(path: str) -> pd.DataFrame:
+    """
+    Read a price csv file with a 'Date' column and index it by date.
+
+    Parameters:
+    - path: str, path of the csv file (e.g. 'datas/df_spy.csv')
+
+    Returns:
+    - pd.DataFrame: DataFrame indexed by pd.DatetimeIndex
+    """
+    df = pd.read_csv(path)
+    df['Date'] = pd.to_datetime(df['Date'])
+    df = df.set_index(['Date'])
+    return df
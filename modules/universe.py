@@ -0,0 +1,78 @@
+import warnings
+import numpy as np
+import pandas as pd
+
+
+def read_membership_csv(path: str) -> pd.DataFrame:
+    """
+    Read an index membership file.
+
+    The csv needs the columns 'asset', 'start' and 'end'. Each row is one period
+    in which the asset belonged to the universe; an empty 'end' means it still does.
+    An asset can have several rows (e.g. removed and later re-added).
+
+    :param path: Path of the membership csv file.
+    :return: DataFrame with columns asset, start, end (datetime).
+    """
+    membership = pd.read_csv(path)
+    membership['start'] = pd.to_datetime(membership['start'])
+    membership['end'] = pd.to_datetime(membership['end'])
+    return membership
+
+
+def build_universe_mask(data: pd.DataFrame, membership: pd.DataFrame = None) -> pd.DataFrame:
+    """
+    Point-in-time eligibility bitmap (dates x assets) for the price panel.
+
+    An asset is eligible on a date if it has a price on that date (listed, not yet
+    delisted, not missing) and, when membership is given, it belongs to the
+    universe on that date. The bitmap is built once and then used as a mask by
+    Strategies and Base_setting at every rebalance.
+
+    :param data: pd.DataFrame, price data (dates x assets)
+    :param membership: pd.DataFrame, optional, membership periods as returned by read_membership_csv
+    :return: Boolean DataFrame with the same index and columns as data.
+    """
+    mask = data.notna().to_numpy()
+
+    if membership is not None:
+        n_dates = len(data.index)
+        # 구간의 시작에 +1, 끝 다음 날에 -1을 더한 뒤 누적합하여 편입 기간을 한 번에 표시합니다.
+        # Mark every membership period at once with +1 at its start, -1 after its end and a cumulative sum.
+        delta = np.zeros((n_dates + 1, data.shape[1]), dtype=np.int32)
+
+        col_pos = data.columns.get_indexer(membership['asset'])
+        known = col_pos >= 0
+        start_pos = data.index.searchsorted(membership['start'].to_numpy()[known], side='left')
+        end = membership['end'].fillna(data.index[-1]).to_numpy()[known]
+        end_pos = data.index.searchsorted(end, side='right')
+
+        np.add.at(delta, (start_pos, col_pos[known]), 1)
+        np.add.at(delta, (end_pos, col_pos[known]), -1)
+        mask = mask & (np.cumsum(delta, axis=0)[:-1] > 0)
+
+    return pd.DataFrame(mask, index=data.index, columns=data.columns)
+
+
+def align_universe(universe: pd.DataFrame, data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Align a universe mask with the price panel by label.
+
+    Strategies read the mask by position, so it must have exactly the dates and
+    assets of data in the same order. Dates or assets missing from the mask are
+    treated as not eligible, with a warning.
+
+    :param universe: Boolean DataFrame (dates x assets), e.g. from build_universe_mask.
+    :param data: pd.DataFrame, price data (dates x assets)
+    :return: Boolean DataFrame with the same index and columns as data (universe itself if already aligned).
+    """
+    if universe.index.equals(data.index) and universe.columns.equals(data.columns):
+        return universe
+
+    missing_assets = data.columns.difference(universe.columns)
+    missing_dates = data.index.difference(universe.index)
+    if len(missing_assets) or len(missing_dates):
+        warnings.warn(f"The universe mask does not cover {len(missing_assets)} assets and "
+                      f"{len(missing_dates)} dates of the data. They are treated as not eligible.", UserWarning)
+
+    return universe.reindex(index=data.index, columns=data.columns, fill_value=False).astype(bool)
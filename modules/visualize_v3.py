@@ -1,8 +1,12 @@
 from matplotlib.ticker import FuncFormatter
 import pandas as pd
 import matplotlib.pyplot as plt
+try:
+    from .risk import drawdown_episodes
+except ImportError:
+    from risk import drawdown_episodes
 
-def visualize(*additional_returns):
+def visualize(*additional_returns, drop_threshold=None):
     plt.figure(figsize=(20, 5))
     
     # Define colors and labels for additional datasets
@@ -39,16 +43,11 @@ def visualize(*additional_returns):
         plt.annotate(f'{max_val:.1%}', (max_point, max_val),
                         textcoords="offset points", xytext=(10,15), ha='center', fontsize=14)
         
-         # Rolling window to check for the drop of more than 20%
-        # rolling_min = dataset['Cum_return'].rolling(window=121, min_periods=1).min()
-        # # 기록사항 : rolling min으로 진행하면, 정확하게 언제부터 언제까지 drop 하게 된건지 로직을 강화해줘야하ㅑㅁ
-        # # Identify the periods with a drop greater than 20%
-        # significant_drops = rolling_min[rolling_min <= -0.20]
-
-        # for drop_date in significant_drops.index:
-        #     # Highlight the period of the significant drop
-        #     start_from = dataset.loc[drop_date-pd.Timedelta(days=121):drop_date,'Cum_return'].idxmax()
-        #     plt.axvspan(start_from, drop_date, color=color, alpha=0.1, linewidth=0)
+        # Highlight the periods (peak -> trough) that dropped more than drop_threshold (e.g. 0.2)
+        if drop_threshold is not None:
+            episodes = drawdown_episodes(1 + dataset['Cum_return'], threshold=drop_threshold)
+            for episode in episodes.itertuples():
+                plt.axvspan(episode.peak, episode.trough, color=color, alpha=0.1, linewidth=0)
 
     # Set y-axis to percentage format
     formatter = FuncFormatter(lambda y, _: f'{y:.0%}')
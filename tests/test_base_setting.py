@@ -0,0 +1,22 @@
+import numpy as np
+import pandas as pd
+
+from modules.base_setting import Base_setting
+
+
+def make_prices(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range('2012-01-02', periods=n, name='Date')
+    values = 100 * np.exp(np.cumsum(rng.normal(0.0005, 0.015, (n, 3)), axis=0))
+    return pd.DataFrame(values, index=index, columns=['A', 'B', 'C'])
+
+
+def test_by_hand_rebalancing_shorter_than_one_window(monkeypatch):
+    data = make_prices()
+    setting = Base_setting(data, (data.index[200], data.index[-1]), 10000)
+    monkeypatch.setattr('builtins.input', lambda prompt='': "{'A': 0.5, 'B': 0.5}")
+
+    full_port = setting.by_hand_rebalancing(window=60, totals_only=True)
+
+    assert full_port.index[0] == data.index[200] and full_port.index[-1] == data.index[-1]
+    assert full_port['Total_value'].iloc[0] == 10000
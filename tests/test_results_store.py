@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from modules.results_store import ResultsStore, run_id_from_key
+
+
+def make_port_return(n=100, seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range('2013-01-02', periods=n)
+    port_return = pd.DataFrame({'Total_return': rng.normal(0.0005, 0.01, n)}, index=index)
+    port_return['Cum_return'] = (1 + port_return['Total_return']).cumprod() - 1
+    return port_return
+
+
+def test_append_with_the_same_run_id_is_skipped(tmp_path):
+    store = ResultsStore(str(tmp_path))
+    run_id = run_id_from_key(('momentum_vol_weighted', 60, ('2013-01-02', '2013-06-03')))
+
+    assert store.append(make_port_return(), 'momentum_vol_weighted', 60, run_id=run_id) == run_id
+    store.compact()
+    assert store.append(make_port_return(), 'momentum_vol_weighted', 60, run_id=run_id) == run_id
+    store.append(make_port_return(seed=1), 'momentum_vol_weighted', 121)
+
+    catalog = store.query()
+    assert len(catalog) == 2
+    assert catalog['run_id'].is_unique
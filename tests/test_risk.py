@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.risk import rolling_max_drawdown, rolling_calmar
+
+
+def brute_force_max_drawdown(values, window):
+    result = np.full(len(values), np.nan)
+    for t in range(window - 1, len(values)):
+        worst = 0.0
+        for i in range(t - window + 1, t + 1):
+            for j in range(i, t + 1):
+                worst = min(worst, values[j] / values[i] - 1)
+        result[t] = worst
+    return result
+
+
+def test_rolling_max_drawdown_ignores_peaks_before_the_window():
+    result = rolling_max_drawdown(pd.Series([2., 1., 1., 1.]), 2)
+    np.testing.assert_allclose(result.to_numpy(), [np.nan, -0.5, 0.0, 0.0])
+
+
+@pytest.mark.parametrize('window', [1, 7, 20, 300])
+def test_rolling_max_drawdown_matches_brute_force(window):
+    rng = np.random.default_rng(0)
+    nav = pd.DataFrame(100 * np.exp(np.cumsum(rng.normal(0, 0.02, (300, 3)), axis=0)))
+
+    result = rolling_max_drawdown(nav, window)
+
+    for column in nav.columns:
+        expected = brute_force_max_drawdown(nav[column].to_numpy(), window)
+        np.testing.assert_allclose(result[column].to_numpy(), expected)
+
+
+def test_rolling_max_drawdown_is_nan_for_windows_with_missing_nav():
+    nav = pd.Series(np.linspace(100, 50, 30))
+    nav[10] = np.nan
+
+    result = rolling_max_drawdown(nav, 5)
+
+    assert result[10:15].isna().all()
+    assert result[4:10].notna().all() and result[15:].notna().all()
+
+
+def test_rolling_calmar_uses_window_max_drawdown():
+    rng = np.random.default_rng(1)
+    nav = pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.02, 300))))
+
+    calmar = rolling_calmar(nav, 20)
+    mdd = brute_force_max_drawdown(nav.to_numpy(), 20)
+    annual_return = (nav / nav.shift(19)) ** (252 / 19) - 1
+
+    expected = annual_return / np.abs(mdd)
+    expected[mdd == 0] = np.nan
+    np.testing.assert_allclose(calmar.to_numpy(), expected.to_numpy())
@@ -0,0 +1,47 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from modules.base_setting import Base_setting
+from modules.sweep import run_sweep
+
+
+def make_prices(n=600, k=4, seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range('2012-01-02', periods=n, name='Date')
+    values = 100 * np.exp(np.cumsum(rng.normal(0.0004, 0.015, (n, k)), axis=0))
+    return pd.DataFrame(values, index=index, columns=[f'A{i}' for i in range(k)])
+
+
+def sweep(data, investment_period, checkpoint_dir):
+    setting = Base_setting(data, investment_period, 10000)
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+        results = run_sweep(setting, ['momentum_vol_weighted'], [60], totals_only=True,
+                            checkpoint_dir=checkpoint_dir)
+    recomputed = any('different run' in str(w.message) for w in caught)
+    return results[('momentum_vol_weighted', 60)], recomputed
+
+
+def test_run_sweep_reuses_finished_grid_point_of_the_same_run(tmp_path):
+    data = make_prices()
+    first, _ = sweep(data, ('2013-01-02', '2013-07-01'), tmp_path)
+    second, recomputed = sweep(data, ('2013-01-02', '2013-07-01'), tmp_path)
+
+    assert not recomputed
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_run_sweep_recomputes_when_period_or_data_change(tmp_path):
+    data = make_prices()
+    sweep(data, ('2013-01-02', '2013-07-01'), tmp_path)
+
+    moved, recomputed = sweep(data, ('2013-03-01', '2013-09-02'), tmp_path)
+    assert recomputed
+    assert moved.index[0] == pd.Timestamp('2013-03-01')
+
+    changed = data.copy()
+    changed.iloc[-1, 0] *= 1.01
+    _, recomputed = sweep(changed, ('2013-03-01', '2013-09-02'), tmp_path)
+    assert recomputed
@@ -0,0 +1,50 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.base_setting import Base_setting
+from modules.universe import build_universe_mask
+
+
+def make_prices(n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range('2012-01-02', periods=n, name='Date')
+    values = 100 * np.exp(np.cumsum(rng.normal(0.0005, 0.015, (n, 5)), axis=0))
+    return pd.DataFrame(values, index=index, columns=list('ABCDE'))
+
+
+def weights_for(data, universe):
+    setting = Base_setting(data, (data.index[300], data.index[-1]), 10000, universe)
+    return setting.strategy.momentum_vol_weighted((data.index[300], data.index[-1]), 120)
+
+
+def test_universe_mask_is_aligned_by_label():
+    data = make_prices()
+    mask = build_universe_mask(data)
+    mask['A'] = False
+
+    aligned = weights_for(data, mask)
+    # 열 순서와 날짜 범위가 다른 mask도 같은 종목을 골라야 합니다.
+    misaligned = mask[list('EDCBA')].iloc[::-1]
+    reordered = weights_for(data, misaligned)
+
+    assert 'A' not in aligned and 'E' in aligned
+    assert reordered.keys() == aligned.keys()
+    np.testing.assert_allclose([reordered[k] for k in aligned], list(aligned.values()))
+
+
+def test_universe_mask_missing_assets_are_not_eligible():
+    data = make_prices()
+    mask = build_universe_mask(data).drop(columns='B')
+
+    with pytest.warns(UserWarning, match='does not cover 1 assets'):
+        setting = Base_setting(data, (data.index[300], data.index[-1]), 10000, mask)
+
+    assert list(setting.universe.columns) == list(data.columns)
+    assert not setting.universe['B'].any()
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        weights = setting.strategy.momentum_vol_weighted((data.index[300], data.index[-1]), 120)
+    assert 'B' not in weights